@@ -50,6 +50,9 @@ def run(
          {'channel-input-dirs': {'training': '/opt/ml/input/training'},
           'model_dir': '/opt/ml/model', ...}
 
+         export SAGEMAKER_REGION, SAGEMAKER_JOB_NAME and CURRENT_HOST
+         >>>env.export_env()
+
 
          >>>hyperparameters = environment.hyperparameters
          {'batch-size': 128, 'model_dir': '/opt/ml/model'}
@@ -137,5 +140,5 @@ def _wait_hostname_resolution():
     boots up and has been documented here:
      https://docs.aws.amazon.com/sagemaker/latest/dg/your-algorithms-training-algo-running-container.html#your-algorithms-training-algo-running-container-dist-training
     """
-    for host in environment.Environment().hosts:
+    for host in environment.get_training_env().hosts:
         _dns_lookup(host)
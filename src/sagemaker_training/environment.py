@@ -17,19 +17,20 @@ filesystem locations, environment variables, and configuration files).
 """
 from __future__ import absolute_import
 
+import glob
 import json
 import logging
 import multiprocessing
 import os
-import shlex
 import socket
 import subprocess
 import sys
 import time
 
 import boto3
+import six
 
-from sagemaker_training import logging_config, mapping, params
+from sagemaker_training import functions, logging_config, mapping, params
 
 logger = logging_config.get_logger()
 
@@ -101,6 +102,7 @@ The input_dir, e.g. /opt/ml/input/, is the directory where SageMaker saves input
 """
 
 _input_data_dir = os.path.join(input_dir, "data")  # type: str
+_channel_path_prefix = os.path.join(_input_data_dir, "")  # type: str
 
 input_config_dir = os.path.join(input_dir, "config")  # type: str
 """str: the path of the input directory, e.g. /opt/ml/input/config/
@@ -179,6 +181,25 @@ def _create_code_dir():  # type: () -> None
 _create_code_dir()
 
 
+def _file_version(path):  # type: (str) -> tuple
+    """Return the inode, modification time, change time and size of a file, used to detect
+    changes to it.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        (tuple): The inode, modification time, change time and size of the file.
+    """
+    stat = os.stat(path)
+    return (
+        stat.st_ino,
+        getattr(stat, "st_mtime_ns", stat.st_mtime),
+        getattr(stat, "st_ctime_ns", stat.st_ctime),
+        stat.st_size,
+    )
+
+
 def _read_json(path):  # type: (str) -> dict
     """Read a JSON file.
 
@@ -206,6 +227,11 @@ def read_hyperparameters():  # type: () -> dict
     deserialized_hps = {}
 
     for k, v in hyperparameters.items():
+        if not isinstance(v, six.string_types):
+            # the value was not serialized as a string and is already deserialized
+            deserialized_hps[k] = v
+            continue
+
         try:
             v = json.loads(v)
         except (ValueError, TypeError):
@@ -281,31 +307,66 @@ def channel_path(channel):  # type: (str) -> str
     Returns:
         str: The input data directory for the specified channel.
     """
-    return os.path.join(_input_data_dir, channel)
+    return _channel_path_prefix + channel
+
 
+_nvidia_gpus_proc_dir = "/proc/driver/nvidia/gpus"  # type: str
+_nvidia_device_files = "/dev/nvidia[0-9]*"  # type: str
+_nvidia_smi_cmd = ("nvidia-smi", "--list-gpus")  # type: tuple
 
+
+def _num_gpus_from_device_files():  # type: () -> int or None
+    """Count the NVIDIA GPU device files, e.g. /dev/nvidia0, available in the current container.
+
+    /proc/driver/nvidia/gpus/ only tells whether the NVIDIA driver is loaded: it is not
+    namespaced and lists every GPU of the host unless the NVIDIA container runtime is used.
+    The device files are only present for the GPUs assigned to the container.
+
+    Returns:
+        int: Number of GPU device files, or None if the NVIDIA driver is not loaded.
+    """
+    if not os.path.isdir(_nvidia_gpus_proc_dir):
+        return None
+    return len(glob.glob(_nvidia_device_files))
+
+
+@functions.memoize
 def num_gpus():  # type: () -> int
     """Return the number of GPUs available in the current container.
 
+    The GPUs are counted from the /dev/nvidia<N> device files when the NVIDIA driver is
+    loaded. Otherwise, the output of nvidia-smi is parsed.
+
     Returns:
         int: Number of GPUs available in the current container.
     """
+    count = _num_gpus_from_device_files()
+    if count is not None:
+        return count
+
     try:
-        cmd = shlex.split("nvidia-smi --list-gpus")
-        output = subprocess.check_output(cmd).decode("utf-8")
-        return sum([1 for x in output.split("\n") if x.startswith("GPU ")])
+        output = subprocess.check_output(_nvidia_smi_cmd).decode("utf-8")
+        return output.count("\nGPU ") + (1 if output.startswith("GPU ") else 0)
     except (OSError, subprocess.CalledProcessError):
         logger.info("No GPUs detected (normal if no gpus installed)")
         return 0
 
 
+@functions.memoize
 def num_cpus():  # type: () -> int
     """Return the number of CPUs available in the current container.
 
+    On Linux, the CPU affinity of the current process is used, so CPU sets applied
+    to the container are respected. Otherwise, the number of CPUs in the host is
+    returned.
+
     Returns:
         int: Number of CPUs available in the current container.
     """
-    return multiprocessing.cpu_count()
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
 
 
 class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-methods
@@ -440,6 +501,38 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         job_name (str): The name of the current training job.
     """
 
+    # On Python 2 the collections.Mapping base classes do not define __slots__, so instances
+    # still get a __dict__ there.
+    __slots__ = (
+        "_additional_framework_parameters",
+        "_channel_input_dirs",
+        "_current_host",
+        "_framework_module",
+        "_hosts",
+        "_hyperparameters",
+        "_input_config_dir",
+        "_input_data_config",
+        "_input_dir",
+        "_is_master",
+        "_job_name",
+        "_log_level",
+        "_master_hostname",
+        "_model_dir",
+        "_module_dir",
+        "_module_name",
+        "_network_interface_name",
+        "_num_cpus",
+        "_num_gpus",
+        "_output_data_dir",
+        "_output_dir",
+        "_output_intermediate_dir",
+        "_resource_config",
+        "_sagemaker_job_name",
+        "_sagemaker_region",
+        "_sagemaker_s3_output",
+        "_user_entry_point",
+    )
+
     def __init__(self, resource_config=None, input_data_config=None, hyperparameters=None):
         """Initialize a read-only snapshot of the container environment.
 
@@ -485,6 +578,8 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         module_name = os.environ.get(params.USER_PROGRAM_ENV, None)
         module_dir = os.environ.get(params.SUBMIT_DIR_ENV, code_dir)
         log_level = int(os.environ.get(params.LOG_LEVEL_ENV, logging.INFO))
+        framework_module = os.environ.get(params.FRAMEWORK_TRAINING_MODULE_ENV, None)
+        job_name = os.environ.get(params.TRAINING_JOB_ENV.upper(), None)
 
         self._current_host = current_host
         self._num_gpus = num_gpus()
@@ -519,9 +614,8 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
             params.REGION_NAME_PARAM, boto3.session.Session().region_name
         )
 
-        os.environ[params.JOB_NAME_ENV] = sagemaker_hyperparameters.get(params.JOB_NAME_PARAM, "")
-        os.environ[params.CURRENT_HOST_ENV] = current_host
-        os.environ[params.REGION_NAME_ENV] = sagemaker_region or ""
+        self._sagemaker_job_name = sagemaker_hyperparameters.get(params.JOB_NAME_PARAM, "")
+        self._sagemaker_region = sagemaker_region or ""
 
         self._hosts = hosts
 
@@ -537,27 +631,33 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         self._input_data_config = input_data_config
         self._output_data_dir = output_data_dir
         self._output_intermediate_dir = output_intermediate_dir
-        self._channel_input_dirs = {channel: channel_path(channel) for channel in input_data_config}
+        # built on first access, see channel_input_dirs
+        self._channel_input_dirs = None
         self._current_host = current_host
 
         # override base class attributes
         if self._module_name is None:
-            self._module_name = str(sagemaker_hyperparameters.get(params.USER_PROGRAM_PARAM, None))
+            program = sagemaker_hyperparameters.get(params.USER_PROGRAM_PARAM, None)
+            self._module_name = program if isinstance(program, six.string_types) else str(program)
+        self._module_name = self._parse_module_name(self._module_name)
         self._user_entry_point = self._user_entry_point or sagemaker_hyperparameters.get(
             params.USER_PROGRAM_PARAM
         )
 
-        self._module_dir = str(sagemaker_hyperparameters.get(params.SUBMIT_DIR_PARAM, code_dir))
+        submit_dir = sagemaker_hyperparameters.get(params.SUBMIT_DIR_PARAM, code_dir)
+        self._module_dir = (
+            submit_dir if isinstance(submit_dir, six.string_types) else str(submit_dir)
+        )
         self._log_level = sagemaker_hyperparameters.get(params.LOG_LEVEL_PARAM, logging.INFO)
         self._sagemaker_s3_output = sagemaker_hyperparameters.get(
             params.S3_OUTPUT_LOCATION_PARAM, None
         )
-        self._framework_module = os.environ.get(params.FRAMEWORK_TRAINING_MODULE_ENV, None)
+        self._framework_module = framework_module
 
         self._input_dir = input_dir
         self._input_config_dir = input_config_dir
         self._output_dir = output_dir
-        self._job_name = os.environ.get(params.TRAINING_JOB_ENV.upper(), None)
+        self._job_name = job_name
 
         self._master_hostname = list(hosts)[0]
         self._is_master = current_host == self._master_hostname
@@ -605,7 +705,7 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         Returns:
             str: Name of the user provided module.
         """
-        return self._parse_module_name(self._module_name)
+        return self._module_name
 
     @property
     def module_dir(self):  # type: () -> str
@@ -690,6 +790,18 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         """
         return self._sagemaker_s3_output
 
+    def export_env(self):  # type: () -> None
+        """Write the SageMaker job name, the current host and the region to os.environ.
+
+        Creating an Environment does not modify os.environ. This method is called once
+        by the trainer before the framework or user entry point is executed. Code that
+        runs an entry point without the trainer must call it, otherwise entry points
+        downloaded from S3 are fetched without the SageMaker region.
+        """
+        os.environ[params.JOB_NAME_ENV] = self._sagemaker_job_name
+        os.environ[params.CURRENT_HOST_ENV] = self._current_host
+        os.environ[params.REGION_NAME_ENV] = self._sagemaker_region
+
     def to_cmd_args(self):
         """Command line arguments representation of the training environment.
 
@@ -765,6 +877,10 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         Returns:
             dict[str, str] With the information about the channels.
         """
+        if self._channel_input_dirs is None:
+            self._channel_input_dirs = {
+                channel: channel_path(channel) for channel in self._input_data_config
+            }
         return self._channel_input_dirs
 
     @property
@@ -912,6 +1028,49 @@ class Environment(mapping.MappingMixin):  # pylint:disable=too-many-public-metho
         return self._framework_module
 
 
+_training_env = None  # type: Environment
+_training_env_key = None  # type: tuple
+
+
+def get_training_env():  # type: () -> Environment
+    """Return an Environment shared by all the callers in the current process.
+
+    The Environment is created on the first call and returned on the subsequent ones.
+    It is created again only if one of the configuration files in /opt/ml/input/config/
+    or one of the environment variables that define the user entry point, the framework
+    module, the job name or the AWS region has changed.
+
+    The same instance is returned to every caller, and its dict properties (for example
+    hyperparameters, resource_config, input_data_config and channel_input_dirs) are
+    returned by reference. Treat it as read-only: copy a dict before modifying it, or
+    create a separate Environment().
+
+    Returns:
+        Environment: The training environment, shared and read-only.
+    """
+    global _training_env, _training_env_key  # pylint: disable=global-statement
+
+    key = tuple(
+        _file_version(path)
+        for path in (hyperparameters_file_dir, resource_config_file_dir, input_data_config_file_dir)
+    ) + tuple(
+        os.environ.get(name)
+        for name in (
+            params.USER_PROGRAM_ENV,
+            params.FRAMEWORK_TRAINING_MODULE_ENV,
+            params.TRAINING_JOB_ENV,
+            "AWS_REGION",
+            "AWS_DEFAULT_REGION",
+        )
+    )
+
+    if _training_env is None or key != _training_env_key:
+        _training_env = Environment()
+        _training_env_key = key
+
+    return _training_env
+
+
 def write_env_vars(env_vars=None):  # type: (dict) -> None
     """Write the dictionary env_vars in the system, as environment variables.
 
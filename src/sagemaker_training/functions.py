@@ -15,6 +15,7 @@ function wrappers.
 """
 from __future__ import absolute_import
 
+import functools
 import inspect
 import sys
 
@@ -95,3 +96,30 @@ def error_wrapper(fn, error_class):
             six.reraise(error_class, error_class(e), sys.exc_info()[2])
 
     return wrapper
+
+
+def memoize(fn):
+    """Wraps a function fn without arguments so that it is only executed once and its
+    result is returned on every subsequent call.
+
+    The cache can be reset by calling `cache_clear` on the returned function.
+
+    Args:
+        fn (function): Function to be wrapped.
+
+    Returns:
+        (function): Function wrapped with a single-value cache.
+    """
+    cache = []
+
+    @functools.wraps(fn)
+    def wrapper():
+        if not cache:
+            cache.append(fn())
+        return cache[0]
+
+    def cache_clear():
+        del cache[:]
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
@@ -123,7 +123,7 @@ def _decode(obj):  # type: (bytes or str or unicode or object) -> unicode # noqa
 
 def split_by_criteria(
     dictionary, keys=None, prefix=None
-):  # type: (dict, set or list or tuple) -> SplitResultSpec
+):  # type: (dict, set or frozenset or list or tuple, str or tuple) -> SplitResultSpec
     """Split a dictionary in two by the provided keys.
 
     Args:
@@ -140,24 +140,33 @@ def split_by_criteria(
                                              criteria.
     """
     keys = keys or []
-    keys = set(keys)
+    if not isinstance(keys, (set, frozenset)):
+        keys = set(keys)
 
-    included_items = {
-        k: dictionary[k]
-        for k in dictionary.keys()
-        if k in keys or (prefix and k.startswith(prefix))
-    }
-    excluded_items = {k: dictionary[k] for k in dictionary.keys() if k not in included_items}
+    included_items = {}
+    excluded_items = {}
+
+    for k, v in dictionary.items():
+        if k in keys or (prefix and k.startswith(prefix)):
+            included_items[k] = v
+        else:
+            excluded_items[k] = v
 
     return SplitResultSpec(included=included_items, excluded=excluded_items)
 
 
+# the properties of a class do not change, so they are looked up once per class
+_properties_cache = {}  # type: dict
+
+
 class MappingMixin(collections.Mapping):
     """A mixin class that allows for the creation of a dictionary like object,
     with any built-in function that works with a dictionary. This is used by the
     environment._Env base class.
     """
 
+    __slots__ = ()
+
     def properties(self):  # type: () -> list
         """
             Returns:
@@ -165,7 +174,11 @@ class MappingMixin(collections.Mapping):
         """
 
         _type = type(self)
-        return [_property for _property in dir(_type) if self._is_property(_property)]
+        if _type not in _properties_cache:
+            _properties_cache[_type] = [
+                _property for _property in dir(_type) if self._is_property(_property)
+            ]
+        return list(_properties_cache[_type])
 
     def _is_property(self, _property):
         return isinstance(getattr(type(self), _property), property)
@@ -182,8 +195,7 @@ class MappingMixin(collections.Mapping):
 
     def __iter__(self):
         """Built-in method override."""
-        items = {_property: getattr(self, _property) for _property in self.properties()}
-        return iter(items)
+        return iter(self.properties())
 
     def __str__(self):
         """Built-in method override."""
@@ -41,17 +41,19 @@ DEFAULT_INVOCATIONS_ACCEPT_ENV = "SAGEMAKER_DEFAULT_INVOCATIONS_ACCEPT"  # type:
 SAGEMAKER_BIND_TO_PORT_ENV = "SAGEMAKER_BIND_TO_PORT"  # type: str
 SAGEMAKER_SAFE_PORT_RANGE_ENV = "SAGEMAKER_SAFE_PORT_RANGE"  # type: str
 FRAMEWORK_TRAINING_MODULE_ENV = "SAGEMAKER_TRAINING_MODULE"  # type: str
-SAGEMAKER_HYPERPARAMETERS = (
-    USER_PROGRAM_PARAM,
-    SUBMIT_DIR_PARAM,
-    ENABLE_METRICS_PARAM,
-    REGION_NAME_PARAM,
-    LOG_LEVEL_PARAM,
-    JOB_NAME_PARAM,
-    DEFAULT_MODULE_NAME_PARAM,
-    TUNING_METRIC_PARAM,
-    S3_OUTPUT_LOCATION_PARAM,
-)  # type: tuple
+SAGEMAKER_HYPERPARAMETERS = frozenset(
+    (
+        USER_PROGRAM_PARAM,
+        SUBMIT_DIR_PARAM,
+        ENABLE_METRICS_PARAM,
+        REGION_NAME_PARAM,
+        LOG_LEVEL_PARAM,
+        JOB_NAME_PARAM,
+        DEFAULT_MODULE_NAME_PARAM,
+        TUNING_METRIC_PARAM,
+        S3_OUTPUT_LOCATION_PARAM,
+    )
+)  # type: frozenset
 MPI_PROCESSES_PER_HOST = "sagemaker_mpi_num_of_processes_per_host"  # type: int
 MPI_NUM_PROCESSES = "sagemaker_mpi_num_processes"  # type: int
 MPI_CUSTOM_OPTIONS = "sagemaker_mpi_custom_mpi_options"  # type: str
@@ -58,6 +58,12 @@ def create_base_path():
     _write_json(resources_dict, environment.resource_config_file_dir)
 
 
+@pytest.fixture(autouse=True)
+def reset_training_env():
+    with patch("sagemaker_training.environment._training_env", None):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def patch_exit_process():
     def _exit(error_code):
@@ -23,7 +23,7 @@ from sagemaker_training import errors, modules
 import test
 
 data = [
-    "from distutils.core import setup\n",
+    "from setuptools import setup\n",
     'setup(name="my_test_script", py_modules=["my_test_script"])',
 ]
 
@@ -13,6 +13,7 @@
 import itertools
 import json
 import logging
+import math
 import os
 import socket
 
@@ -61,6 +62,15 @@ ALL_HYPERPARAMETERS = dict(
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_system_caches():
+    environment.num_gpus.cache_clear()
+    environment.num_cpus.cache_clear()
+    yield
+    environment.num_gpus.cache_clear()
+    environment.num_cpus.cache_clear()
+
+
 def test_read_hyperparameters():
     test.write_json(ALL_HYPERPARAMETERS, environment.hyperparameters_file_dir)
 
@@ -92,6 +102,40 @@ def test_read_exception(loads):
     assert environment.read_hyperparameters() == {"a": 1}
 
 
+def test_read_hyperparameters_with_nan_and_large_integers():
+    hyperparameters = {"lr": "NaN", "seed": "18446744073709551617"}
+    test.write_json(hyperparameters, environment.hyperparameters_file_dir)
+
+    hyperparameters = environment.read_hyperparameters()
+
+    assert math.isnan(hyperparameters["lr"])
+    assert hyperparameters["seed"] == 18446744073709551617
+
+
+def test_read_hyperparameters_with_non_serialized_nan_and_large_integers():
+    hyperparameters = {"lr": float("nan"), "seed": 18446744073709551617}
+    test.write_json(hyperparameters, environment.hyperparameters_file_dir)
+
+    hyperparameters = environment.read_hyperparameters()
+
+    assert math.isnan(hyperparameters["lr"])
+    assert hyperparameters["seed"] == 18446744073709551617
+
+
+@patch(
+    "sagemaker_training.environment._read_json",
+    lambda x: {"batch_size": 32, "learning_rate": json.dumps(0.001), "name": "net"},
+)
+@patch("json.loads", wraps=json.loads)
+def test_read_hyperparameters_only_parses_serialized_values(json_loads):
+    assert environment.read_hyperparameters() == {
+        "batch_size": 32,
+        "learning_rate": 0.001,
+        "name": "net",
+    }
+    assert sorted(args[0] for args, _ in json_loads.call_args_list) == ["0.001", "net"]
+
+
 def test_resource_config():
     test.write_json(RESOURCE_CONFIG, environment.resource_config_file_dir)
 
@@ -110,21 +154,66 @@ def test_channel_input_dirs():
     assert environment.channel_path("training") == os.path.join(input_data_path, "training")
 
 
+@patch("sagemaker_training.environment._num_gpus_from_device_files", lambda: None)
 @patch("subprocess.check_output", lambda s: b"GPU 0\nGPU 1")
 def test_gpu_count_in_gpu_instance():
     assert environment.num_gpus() == 2
 
 
+@patch("sagemaker_training.environment._num_gpus_from_device_files", lambda: None)
+@patch(
+    "subprocess.check_output",
+    lambda s: b"GPU 0: Tesla V100 (UUID: GPU-1)\nGPU 1: Tesla V100 (UUID: GPU-2)\n",
+)
+def test_gpu_count_ignores_gpu_names_inside_lines():
+    assert environment.num_gpus() == 2
+
+
+@patch("sagemaker_training.environment._num_gpus_from_device_files", lambda: None)
 @patch("subprocess.check_output", side_effect=OSError())
 def test_gpu_count_in_cpu_instance(check_output):
     assert environment.num_gpus() == 0
 
 
-@patch("multiprocessing.cpu_count", lambda: 2)
+@patch("subprocess.check_output")
+@patch("os.path.isdir", lambda path: True)
+@patch("glob.glob", lambda pattern: ["/dev/nvidia0", "/dev/nvidia1", "/dev/nvidia2"])
+def test_gpu_count_from_device_files(check_output):
+    assert environment.num_gpus() == 3
+
+    check_output.assert_not_called()
+
+
+@patch("subprocess.check_output")
+@patch("os.path.isdir", lambda path: True)
+@patch("glob.glob", lambda pattern: [])
+def test_gpu_count_with_host_gpus_not_assigned_to_container(check_output):
+    assert environment.num_gpus() == 0
+
+    check_output.assert_not_called()
+
+
+@patch("os.sched_getaffinity", lambda pid: {0, 1, 2, 3}, create=True)
+@patch("multiprocessing.cpu_count", lambda: 96)
 def test_cpu_count():
+    assert environment.num_cpus() == 4
+
+
+@patch("os.sched_getaffinity", side_effect=AttributeError(), create=True)
+@patch("multiprocessing.cpu_count", lambda: 2)
+def test_cpu_count_without_affinity(sched_getaffinity):
     assert environment.num_cpus() == 2
 
 
+@patch("sagemaker_training.environment._num_gpus_from_device_files", lambda: None)
+@patch("subprocess.check_output", return_value=b"GPU 0\nGPU 1")
+def test_gpu_count_is_cached(check_output):
+    assert environment.num_gpus() == 2
+    assert environment.num_gpus() == 2
+
+    check_output.assert_called_once_with(("nvidia-smi", "--list-gpus"))
+
+
 @pytest.fixture(name="training_env")
 def create_training_env():
     with patch(
@@ -155,6 +244,31 @@ def test_create_training_env_without_training_files_and_directories_should_not_f
     assert training_env.hosts == [hostname]
 
 
+def test_get_training_env_is_shared():
+    with patch("sagemaker_training.environment.Environment") as training_env:
+        assert environment.get_training_env() is environment.get_training_env()
+
+    training_env.assert_called_once_with()
+
+
+def test_get_training_env_when_configuration_changes():
+    test.write_json(INPUT_DATA_CONFIG, environment.input_data_config_file_dir)
+    training_env = environment.get_training_env()
+
+    test.write_json({"train": INPUT_DATA_CONFIG["train"]}, environment.input_data_config_file_dir)
+    new_training_env = environment.get_training_env()
+
+    assert new_training_env is not training_env
+    assert set(new_training_env.channel_input_dirs) == {"train"}
+
+
+def test_get_training_env_when_region_changes():
+    training_env = environment.get_training_env()
+
+    with patch.dict("os.environ", {"AWS_DEFAULT_REGION": "eu-west-1"}):
+        assert environment.get_training_env() is not training_env
+
+
 def test_env():
     assert environment.input_dir.endswith("/opt/ml/input")
     assert environment.input_config_dir.endswith("/opt/ml/input/config")
@@ -186,6 +300,40 @@ def test_training_env(training_env):
     assert training_env.additional_framework_parameters == {"sagemaker_parameter_server_num": 2}
 
 
+def test_training_env_does_not_modify_environ():
+    environ = dict(os.environ)
+
+    environment.Environment()
+
+    assert dict(os.environ) == environ
+
+
+def test_export_env(training_env):
+    training_env.export_env()
+
+    assert os.environ[params.JOB_NAME_ENV] == "sagemaker-training-job"
+    assert os.environ[params.CURRENT_HOST_ENV] == RESOURCE_CONFIG["current_host"]
+    assert os.environ[params.REGION_NAME_ENV] == "us-west-2"
+
+
+def test_channel_input_dirs_are_built_once(training_env):
+    channel_input_dirs = training_env.channel_input_dirs
+
+    assert isinstance(channel_input_dirs, dict)
+    assert set(channel_input_dirs) == set(INPUT_DATA_CONFIG)
+    assert training_env.channel_input_dirs is channel_input_dirs
+
+
+@pytest.mark.skipif(
+    six.PY2, reason="the collections.Mapping ABCs do not define __slots__ on Python 2"
+)
+def test_training_env_has_no_instance_dict(training_env):
+    assert not hasattr(training_env, "__dict__")
+
+    with pytest.raises(AttributeError):
+        training_env.undefined_attribute = True
+
+
 def test_env_mapping_properties(training_env):
     assert set(training_env.properties()) == {
         "additional_framework_parameters",
@@ -230,6 +378,29 @@ def test_env_dictionary():
     assert test_env["log_level"] == logging.INFO
 
 
+@patch("sagemaker_training.environment.read_hyperparameters", lambda: {})
+def test_env_module_name_without_sagemaker_program():
+    with patch.dict(os.environ):
+        os.environ.pop(params.USER_PROGRAM_ENV, None)
+        env = environment.Environment()
+
+    assert env.module_name == "None"
+    assert env.user_entry_point is None
+
+
+@patch(
+    "sagemaker_training.environment.read_hyperparameters",
+    lambda: {params.SUBMIT_DIR_PARAM: 42, params.USER_PROGRAM_PARAM: "program.py"},
+)
+def test_env_module_dir_with_non_str_submit_directory():
+    with patch.dict(os.environ):
+        os.environ.pop(params.USER_PROGRAM_ENV, None)
+        env = environment.Environment()
+
+    assert env.module_name == "program"
+    assert env.module_dir == "42"
+
+
 @pytest.mark.parametrize("sagemaker_program", ["program.py", "program"])
 def test_env_module_name(sagemaker_program):
     session_mock = Mock()
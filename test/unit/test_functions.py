@@ -56,3 +56,22 @@ def test_error_wrapper_exception():
     with pytest.raises(NotImplementedError) as e:
         functions.error_wrapper(lambda x: x, NotImplementedError)(2, 3)
     assert type(e.value.args[0]) == TypeError
+
+
+def test_memoize():
+    calls = []
+
+    def fn():
+        calls.append(None)
+        return 42
+
+    memoized = functions.memoize(fn)
+
+    assert memoized() == 42
+    assert memoized() == 42
+    assert len(calls) == 1
+
+    memoized.cache_clear()
+
+    assert memoized() == 42
+    assert len(calls) == 2
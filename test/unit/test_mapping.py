@@ -15,6 +15,7 @@ from __future__ import absolute_import
 
 import os
 
+from mock import patch
 import pytest
 
 from sagemaker_training import environment, mapping, params
@@ -27,6 +28,7 @@ from sagemaker_training import environment, mapping, params
         ({"x": 1, "y": 2}, "x", ({"x": 1}, {"y": 2})),
         ({"x": 1, "y": 2}, (), ({}, {"x": 1, "y": 2})),
         ({"x": 1, "y": 2}, ("x", "y"), ({"x": 1, "y": 2}, {})),
+        ({"x": 1, "y": 2}, frozenset(("x",)), ({"x": 1}, {"y": 2})),
     ],
 )
 def test_split_by_criteria_with_keys(dictionary, keys, expected):
@@ -78,6 +80,20 @@ def test_mapping_mixin():
     assert str(p) in ("{'a': 1, 'b': 2}", "{'b': 2, 'a': 1}")
 
 
+def test_mapping_mixin_properties_are_looked_up_once():
+    p = ProcessEnvironment()
+
+    with patch("sagemaker_training.mapping.dir", create=True) as mocked_dir:
+        mocked_dir.return_value = ["a", "b", "d"]
+        mapping._properties_cache.pop(ProcessEnvironment, None)
+
+        assert p.properties() == ["a", "b"]
+        assert ProcessEnvironment().properties() == ["a", "b"]
+        assert dict(p) == {"a": 1, "b": 2}
+
+    mocked_dir.assert_called_once_with(ProcessEnvironment)
+
+
 @pytest.mark.parametrize(
     "property, error, msg",
     [
@@ -162,6 +162,17 @@ def test_train_script(_exit, training_env, run):
     _exit.assert_called_with(trainer.SUCCESS_CODE)
 
 
+@patch("inotify_simple.INotify", MagicMock())
+@patch("boto3.client", MagicMock())
+@patch("importlib.import_module")
+@patch("sagemaker_training.environment.Environment", new_callable=Environment)
+@patch("sagemaker_training.trainer._exit_processes")
+def test_train_exports_env(_exit, training_env, import_module):
+    trainer.train()
+
+    training_env().export_env.assert_called_once_with()
+
+
 @patch("importlib.import_module")
 @patch("sagemaker_training.intermediate_output.start_sync")
 @patch("sagemaker_training.environment.Environment", EnvironmentNoIntermediate)